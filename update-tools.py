@@ -18,109 +18,368 @@ Files without a <title> tag are ignored (treated as non-tool HTML).
 index.html is always excluded.
 """
 
+from __future__ import annotations
+
+import functools
+import json
+import os
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    import pygit2  # optional: read history in-process instead of spawning git
+except ImportError:
+    pygit2 = None
+
 REPO_ROOT = Path(__file__).parent
 EXCLUDE = {"index.html"}
+CACHE_FILE = REPO_ROOT / ".update-tools-cache.json"
+# Shared by every git invocation; on Windows, don't allocate a console per spawn.
+# git emits paths as UTF-8 (core.quotePath=false), so don't decode with the locale;
+# surrogateescape keeps one non-UTF-8 path in history from failing the whole call.
+GIT_RUN_KWARGS = {
+    "capture_output": True,
+    "encoding": "utf-8",
+    "errors": "surrogateescape",
+    "cwd": REPO_ROOT,
+}
+if sys.platform == "win32":
+    GIT_RUN_KWARGS["creationflags"] = subprocess.CREATE_NO_WINDOW
+HEAD_CHUNK = 4096
+HEAD_LIMIT = 64 * 1024
 
 README_START = "<!-- tools-start -->"
 README_END = "<!-- tools-end -->"
 INDEX_START = "<!-- tools-start -->"
 INDEX_END = "<!-- tools-end -->"
 
+# index.html list item templates, keyed by (has description, has date).
+_INDEX_LINK = '      <li><a href="{file}">{title}</a>'
+_INDEX_DESC = " &mdash; {desc}"
+_INDEX_DATE = ' <span style="color:#888;font-size:0.8em">({date})</span>'
+_INDEX_ITEMS = {
+    (True, True): _INDEX_LINK + _INDEX_DESC + _INDEX_DATE + "</li>",
+    (True, False): _INDEX_LINK + _INDEX_DESC + "</li>",
+    (False, True): _INDEX_LINK + _INDEX_DATE + "</li>",
+    (False, False): _INDEX_LINK + "</li>",
+}
+
+_TITLE_RE = re.compile(r"<title>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_DESC_RE = re.compile(
+    r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']',
+    re.IGNORECASE,
+)
+_P_RE = re.compile(r"<p[^>]*>(.*?)</p>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@dataclass(frozen=True)
+class Tool:
+    file: str  # file name, relative to REPO_ROOT
+    path: Path
+    title: str
+    description: str
+    last_modified: str  # YYYY-MM-DD, or '' if the file has no commits
+
 
 def extract_title(html: str) -> str:
-    m = re.search(r"<title>(.*?)</title>", html, re.IGNORECASE | re.DOTALL)
+    m = _TITLE_RE.search(html)
     return m.group(1).strip() if m else ""
 
 
 def extract_description(html: str) -> str:
     # Prefer <meta name="description" content="...">
-    m = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']',
-        html,
-        re.IGNORECASE,
-    )
+    m = _DESC_RE.search(html)
     if m:
         return m.group(1).strip()
     # Fallback: first <p> text content
-    m = re.search(r"<p[^>]*>(.*?)</p>", html, re.IGNORECASE | re.DOTALL)
+    m = _P_RE.search(html)
     if m:
-        return re.sub(r"<[^>]+>", "", m.group(1)).strip()
+        return _TAG_RE.sub("", m.group(1)).strip()
     return ""
 
 
-def get_git_date(path: Path) -> str:
-    """Return the date of the last git commit touching this file (YYYY-MM-DD), or ''."""
+def get_all_git_dates_pygit2() -> dict[str, str] | None:
+    """get_all_git_dates() via libgit2; None if pygit2 is unavailable or fails."""
+    if pygit2 is None:
+        return None
+    try:
+        repo = pygit2.Repository(str(REPO_ROOT))
+        if repo.head_is_unborn:
+            return {}
+        dates = {}
+        # Children before parents, so the first commit seen for a path is its latest.
+        order = pygit2.GIT_SORT_TOPOLOGICAL | pygit2.GIT_SORT_TIME
+        for commit in repo.walk(repo.head.target, order):
+            if commit.parents:
+                diffs = [p.tree.diff_to_tree(commit.tree) for p in commit.parents]
+            else:
+                diffs = [commit.tree.diff_to_tree(swap=True)]
+            # Like `git log -c`: a merge only counts for paths that differ
+            # from every parent, so clean merges touch nothing.
+            changed = None
+            for diff in diffs:
+                paths = {d.new_file.path for d in diff.deltas if d.status_char() != "D"}
+                changed = paths if changed is None else changed & paths
+            if not changed:
+                continue
+            author = commit.author
+            date = datetime.fromtimestamp(
+                author.time, timezone(timedelta(minutes=author.offset))
+            ).strftime("%Y-%m-%d")
+            for path in changed:
+                dates.setdefault(path, date)
+        return dates
+    except Exception:
+        return None
+
+
+def get_all_git_dates() -> dict[str, str] | None:
+    """Return {repo-relative path: date of the last commit touching it (YYYY-MM-DD)}.
+
+    Uses pygit2 when installed; otherwise walks the whole history in a
+    single `git log` call rather than spawning one process per file.
+    Returns None (after printing a warning) if the history can't be read.
+    """
+    dates = get_all_git_dates_pygit2()
+    if dates is not None:
+        return dates
     try:
         result = subprocess.run(
-            ["git", "log", "--format=%ad", "--date=format:%Y-%m-%d", "-1", "--", str(path)],
-            capture_output=True,
-            text=True,
-            cwd=REPO_ROOT,
+            [
+                "git",
+                "-c",
+                "core.quotePath=false",
+                "log",
+                "--reverse",
+                "-c",  # list files a merge changed relative to every parent
+                "--name-status",
+                "--format=format:%ad",
+                "--date=format:%Y-%m-%d",
+            ],
+            **GIT_RUN_KWARGS,
         )
-        return result.stdout.strip()
+    except Exception as e:
+        print(f"  warning: could not run git log: {e}", file=sys.stderr)
+        return None
+    if result.returncode != 0:
+        print(f"  warning: git log failed: {result.stderr.strip()}", file=sys.stderr)
+        return None
+    dates = {}
+    current = ""
+    for line in result.stdout.splitlines():
+        if not line:
+            continue
+        if "\t" not in line:
+            current = line  # commit header: the author date
+            continue
+        status, *paths = line.split("\t")
+        if status.startswith("D"):
+            continue
+        # Oldest commit first, so later commits overwrite earlier ones.
+        # For renames/copies the last field is the new path.
+        dates[paths[-1]] = current
+    return dates
+
+
+def get_head() -> str:
+    """Return the commit sha of HEAD, or '' outside a git checkout."""
+    if pygit2 is not None:
+        try:
+            return str(pygit2.Repository(str(REPO_ROOT)).head.target)
+        except Exception:
+            pass  # fall through to the git CLI
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], **GIT_RUN_KWARGS)
+        return result.stdout.strip() if result.returncode == 0 else ""
     except Exception:
         return ""
 
 
-def get_tools() -> list[dict]:
+@functools.lru_cache(maxsize=None)
+def get_cached_git_dates() -> dict[str, str]:
+    """Like get_all_git_dates(), but reuse the result from the last run if HEAD hasn't moved.
+
+    Dates only depend on committed history, so the cache (CACHE_FILE) is
+    keyed by the HEAD sha alone and holds just the most recent entry.
+    """
+    head = get_head()
+    if not head:
+        return get_all_git_dates() or {}
+    try:
+        cache = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    dates = cache.get(head) if isinstance(cache, dict) else None
+    if isinstance(dates, dict):
+        return dates
+    dates = get_all_git_dates()
+    if dates is None:
+        return {}  # don't cache a failed walk; the next run should retry
+    try:
+        CACHE_FILE.write_text(json.dumps({head: dates}, indent=2, sort_keys=True), encoding="utf-8")
+    except OSError as e:
+        print(f"  warning: could not write {CACHE_FILE.name}: {e}", file=sys.stderr)
+    return dates
+
+
+@functools.lru_cache(maxsize=None)
+def get_git_date(path: Path) -> str:
+    """Return the date of the last git commit touching this file (YYYY-MM-DD), or ''.
+
+    Served from the history read once per run by get_cached_git_dates();
+    relative paths are taken relative to REPO_ROOT.
+    """
+    path = Path(path)
+    if path.is_absolute():
+        try:
+            path = path.relative_to(REPO_ROOT)
+        except ValueError:
+            return ""  # outside the repo
+    return get_cached_git_dates().get(path.as_posix(), "")
+
+
+def read_head(path: str) -> tuple[str, bool]:
+    """Return the start of an HTML file, up to and including </head>.
+
+    Reads in HEAD_CHUNK pieces and stops at </head> or HEAD_LIMIT bytes, so
+    large inline scripts and styles further down are never read. The flag is
+    True when HEAD_LIMIT cut the read short before </head> was seen.
+    """
+    buf = b""
+    with open(path, "rb") as f:
+        while len(buf) < HEAD_LIMIT:
+            chunk = f.read(HEAD_CHUNK)
+            if not chunk:
+                break
+            # Re-check a few bytes before the new chunk in case </head> straddles it.
+            search_from = max(0, len(buf) - len("</head>"))
+            buf += chunk
+            if b"</head>" in buf[search_from:].lower():
+                break
+        else:
+            return buf.decode("utf-8", "replace"), True
+    return buf.decode("utf-8", "replace"), False
+
+
+def read_html(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", "replace")
+
+
+def load_tool(entry: os.DirEntry) -> Tool | None:
+    """Read one HTML file's metadata; None if it has no <title> (not a tool)."""
+    head, truncated = read_head(entry.path)
+    html = None
+    title = extract_title(head)
+    if not title and truncated:
+        # <title> may sit after a large inline <style>/<script>; check the rest.
+        html = read_html(entry.path)
+        title = extract_title(html)
+    if not title:
+        return None
+    description = extract_description(head)
+    if not description:
+        # No <meta name="description"> up front; the <p> fallback needs the body.
+        description = extract_description(html or read_html(entry.path))
+    path = Path(entry.path)
+    return Tool(
+        file=entry.name,
+        path=path,
+        title=title,
+        description=description,
+        last_modified=get_git_date(path),
+    )
+
+
+def get_tools() -> list[Tool]:
     tools = []
-    for path in REPO_ROOT.glob("*.html"):
-        if path.name in EXCLUDE:
-            continue
+    get_cached_git_dates()  # read history once up front, before the worker threads need it
+    with os.scandir(REPO_ROOT) as it:
+        entries = [
+            e for e in it if e.name.endswith(".html") and e.name not in EXCLUDE and e.is_file()
+        ]
+    entries.sort(key=lambda e: e.name)
+    # Files are independent and reads release the GIL, so overlap them.
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(entries)))) as ex:
+        futures = [ex.submit(load_tool, entry) for entry in entries]
+    for entry, future in zip(entries, futures):
         try:
-            html = path.read_text(encoding="utf-8")
+            tool = future.result()
         except OSError as e:
-            print(f"  warning: could not read {path.name}: {e}", file=sys.stderr)
+            print(f"  warning: could not read {entry.name}: {e}", file=sys.stderr)
             continue
-        title = extract_title(html)
-        if not title:
-            continue  # not a tool — skip silently
-        tools.append(
-            {
-                "file": path.name,
-                "path": path,
-                "title": title,
-                "description": extract_description(html),
-                "last_modified": get_git_date(path),
-            }
-        )
-    tools.sort(key=lambda t: t["title"].lower())
+        if tool:
+            tools.append(tool)
+    tools.sort(key=lambda t: t.title.lower())
     return tools
 
 
 def replace_section(text: str, start: str, end: str, new_content: str) -> str:
     """Replace content between start/end markers (inclusive of markers)."""
-    pattern = rf"{re.escape(start)}.*?{re.escape(end)}"
-    replacement = f"{start}\n{new_content}\n{end}"
-    result, n = re.subn(pattern, replacement, text, flags=re.DOTALL)
-    if n == 0:
+    i = text.find(start)
+    j = text.find(end, i + len(start)) if i != -1 else -1
+    if j == -1:
         raise ValueError(f"Markers not found in file: {start!r} / {end!r}")
-    return result
+    if text[i + len(start) : j].strip() == new_content.strip():
+        return text  # already current; callers see no change and skip the write
+    return f"{text[:i]}{start}\n{new_content}\n{end}{text[j + len(end):]}"
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write text (UTF-8, text mode) to a sibling temp file, then rename it over path.
+
+    Readers see either the old or the new file, never a truncated one. The
+    temp name is unique, so concurrent runs never write into each other's file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
 
 
-def update_readme(tools: list[dict]) -> None:
+def update_readme(tools: list[Tool]) -> None:
     path = REPO_ROOT / "README.md"
     text = path.read_text(encoding="utf-8")
 
+    rows = ["| Tool | Description | Updated |", "|------|-------------|--------|"]
     if tools:
-        rows = "\n".join(
-            f'| [{t["title"]}]({t["file"]}) | {t["description"]} | {t["last_modified"] or "—"} |'
-            for t in tools
-        )
-        table = f"| Tool | Description | Updated |\n|------|-------------|--------|\n{rows}"
+        row = "| [{title}]({file}) | {desc} | {date} |"
+        for t in tools:
+            rows.append(
+                row.format(
+                    title=t.title,
+                    file=t.file,
+                    desc=t.description,
+                    date=t.last_modified or "—",
+                )
+            )
     else:
-        table = "| Tool | Description | Updated |\n|------|-------------|--------|\n| _(no tools yet)_ | | |"
+        rows.append("| _(no tools yet)_ | | |")
+    table = "\n".join(rows)
 
-    path.write_text(replace_section(text, README_START, README_END, table), encoding="utf-8")
+    new_text = replace_section(text, README_START, README_END, table)
+    if new_text == text:
+        print(f"  README.md unchanged ({len(tools)} tool(s))")
+        return
+    write_atomic(path, new_text)
     print(f"  README.md updated ({len(tools)} tool(s))")
 
 
-def update_index(tools: list[dict]) -> None:
+def update_index(tools: list[Tool]) -> None:
     path = REPO_ROOT / "index.html"
     if not path.exists():
         print("  index.html not found — skipping")
@@ -129,25 +388,25 @@ def update_index(tools: list[dict]) -> None:
     text = path.read_text(encoding="utf-8")
 
     if tools:
-        items = []
+        items = ["<ul>"]
         for t in tools:
-            date_badge = (
-                f' <span style="color:#888;font-size:0.8em">({t["last_modified"]})</span>'
-                if t["last_modified"]
-                else ""
-            )
+            desc = t.description
+            date = t.last_modified
             items.append(
-                "      <li>"
-                f'<a href="{t["file"]}">{t["title"]}</a>'
-                + (f' &mdash; {t["description"]}' if t["description"] else "")
-                + date_badge
-                + "</li>"
+                _INDEX_ITEMS[bool(desc), bool(date)].format(
+                    file=t.file, title=t.title, desc=desc, date=date
+                )
             )
-        content = "<ul>\n" + "\n".join(items) + "\n    </ul>"
+        items.append("    </ul>")
+        content = "\n".join(items)
     else:
         content = "<p>No tools yet. Check back soon.</p>"
 
-    path.write_text(replace_section(text, INDEX_START, INDEX_END, content), encoding="utf-8")
+    new_text = replace_section(text, INDEX_START, INDEX_END, content)
+    if new_text == text:
+        print(f"  index.html unchanged ({len(tools)} tool(s))")
+        return
+    write_atomic(path, new_text)
     print(f"  index.html updated ({len(tools)} tool(s))")
 
 
@@ -157,7 +416,7 @@ def main() -> None:
     if not tools:
         print("  No tools found (no .html files with <title> tags, excluding index.html)")
     else:
-        print(f"  Found: {', '.join(t['file'] for t in tools)}")
+        print(f"  Found: {', '.join(t.file for t in tools)}")
     update_readme(tools)
     update_index(tools)
     print("Done.")